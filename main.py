@@ -5,10 +5,16 @@ Fetches stats, trims videos, downloads them, and adds subtitles
 
 import sys
 import os
+import argparse
+import mmap
 import re
 import json
-from datetime import datetime
+import time
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 
 try:
     import yt_dlp
@@ -23,6 +29,62 @@ except ImportError:
     sys.exit(1)
 
 
+# Accepted YouTube URL forms: youtube.com/watch?v=, m.youtube.com/watch?v=, youtu.be/
+# Group 1 or 2 captures the video ID
+_YT_URL_RE = re.compile(r'^(?:https?://)?(?:www\.|m\.)?(?:youtube\.com/watch\?v=([\w-]+)|youtu\.be/([\w-]+))')
+
+# On-disk extract_info cache. The TTL stays well below the lifetime of
+# YouTube's signed format URLs so cached info can still be downloaded.
+_INFO_CACHE_DIR = Path.home() / '.cache' / 'ytclipzap'
+_INFO_CACHE_TTL = 3600
+
+# yt-dlp leftovers after '<name>.': pre-merge format files (f137.mp4), merger
+# temp files, .part/.part-FragN partial files, .ytdl state and aria2c control files
+_LEFTOVER_RE = re.compile(r'f\d+(?:-\w+)?\.\w+|temp\.\w+|.+\.(?:part(?:-Frag\d+)?|ytdl|aria2)')
+
+# Characters stripped from video titles when building output filenames
+_SAFE_TITLE_RE = re.compile(r'[^\w \-]+')
+
+# One SRT cue: index, start/end as HH:MM:SS,mmm groups, then the cue text as
+# the non-empty lines up to the next blank line (empty for a cue with no text).
+# Anything after the end time, like position tags, is ignored, as is a UTF-8 BOM.
+# Bytes pattern so it can run directly over an mmap of the file; accepts LF
+# and CRLF line endings since the file is not opened in text mode.
+_SRT_RE = re.compile(
+    rb'^(?:\xef\xbb\xbf)?(\d+)\r?\n(\d\d):(\d\d):(\d\d),(\d{3})[ \t]*-->[ \t]*(\d\d):(\d\d):(\d\d),(\d{3})[^\r\n]*(?:\r?\n|\Z)'
+    rb'((?:[^\r\n]+(?:\r?\n|\Z))*)',
+    re.M
+)
+
+# H.264 encoders for burning subtitles, fastest first. VAAPI is left out because
+# it needs an explicit device and hwupload filter chain.
+_HW_ENCODERS = (
+    ('h264_nvenc', {'preset': 'p5'}),
+    ('h264_qsv', {'preset': 'veryfast'}),
+    ('h264_videotoolbox', {}),
+)
+_SOFTWARE_ENCODER = ('libx264', {'preset': 'veryfast', 'threads': 0})
+
+# Failures of the SRT fetch that leave the clip without subtitles
+_SRT_DOWNLOAD_ERRORS = (yt_dlp.networking.exceptions.RequestError, OSError)
+
+# Display names for common subtitle language codes
+_LANG_NAMES = MappingProxyType({
+    'en': 'English',
+    'es': 'Spanish',
+    'fr': 'French',
+    'de': 'German',
+    'it': 'Italian',
+    'pt': 'Portuguese',
+    'ru': 'Russian',
+    'ja': 'Japanese',
+    'ko': 'Korean',
+    'zh': 'Chinese',
+    'ar': 'Arabic',
+    'hi': 'Hindi'
+})
+
+
 class Colors:
     """ANSI color codes for terminal output"""
     RED = '\033[91m'
@@ -41,10 +103,24 @@ class Colors:
 
 
 class YouTubeProcessor:
-    def __init__(self):
+    def __init__(self, cookies_from_browser=None):
         self.video_info = None
         self.video_url = None
-        self.available_subtitles = {}
+        self._video_id = None
+        self._info_from_cache = False
+        self._has_subs = False
+        self._temp_paths = []
+        self._video_encoder = None
+        # One YoutubeDL instance serves both the metadata fetch and the download
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'writesubtitles': False,
+            'writeautomaticsub': False,
+        }
+        if cookies_from_browser:
+            ydl_opts['cookiesfrombrowser'] = (cookies_from_browser,)
+        self._ydl = yt_dlp.YoutubeDL(ydl_opts)
         self.quality_options = {
             '1': ('best[height<=360]/best', '360p'),
             '2': ('best[height<=480]/best', '480p'), 
@@ -53,14 +129,13 @@ class YouTubeProcessor:
             '5': ('best', 'Best available')
         }
         
+    def close(self):
+        """Close the shared YoutubeDL instance, saving cookies and closing its connections"""
+        self._ydl.close()
+    
     def validate_url(self, url):
         """Validate YouTube URL"""
-        youtube_patterns = [
-            r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=[\w-]+',
-            r'(?:https?://)?(?:www\.)?youtu\.be/[\w-]+',
-            r'(?:https?://)?(?:m\.)?youtube\.com/watch\?v=[\w-]+'
-        ]
-        return any(re.match(pattern, url.strip()) for pattern in youtube_patterns)
+        return bool(_YT_URL_RE.match(url.strip()))
     
     def fetch_stats(self, url):
         """Fetch video statistics and metadata"""
@@ -69,26 +144,17 @@ class YouTubeProcessor:
         
         self.video_url = url.strip()
         
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'writesubtitles': False,
-            'writeautomaticsub': False,
-        }
-        
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            self._video_id = self._get_video_id(self.video_url)
+            self.video_info = self._load_cached_info(self._video_id)
+            self._info_from_cache = self.video_info is not None
+            if not self._info_from_cache:
                 print("Fetching video information...")
-                self.video_info = ydl.extract_info(self.video_url, download=False)
-                
-                # Get available subtitles
-                self.available_subtitles = self.video_info.get('subtitles', {})
-                auto_subtitles = self.video_info.get('automatic_captions', {})
-                
-                # Merge manual and auto subtitles
-                all_subtitles = {**self.available_subtitles, **auto_subtitles}
-                self.available_subtitles = all_subtitles
-                
+                self._extract_video_info()
+            
+            # Check for manual or auto subtitles
+            self._has_subs = bool(self.video_info.get('subtitles') or self.video_info.get('automatic_captions'))
+            
             return {
                 'title': self.video_info.get('title', 'N/A'),
                 'duration': self._format_duration(self.video_info.get('duration', 0)),
@@ -98,14 +164,54 @@ class YouTubeProcessor:
                 'upload_date': self._format_date(self.video_info.get('upload_date', '')),
                 'uploader': self.video_info.get('uploader', 'N/A'),
                 'description': self.video_info.get('description', 'N/A')[:100] + '...' if self.video_info.get('description') else 'N/A',
-                'has_subtitles': len(self.available_subtitles) > 0
+                'has_subtitles': self._has_subs
             }
         except Exception as e:
             raise Exception(f"Failed to fetch video info: {str(e)}")
     
+    def _extract_video_info(self):
+        """Extract video info from YouTube and store it in the cache"""
+        self.video_info = self._ydl.extract_info(self.video_url, download=False)
+        self._info_from_cache = False
+        self._save_cached_info(self._video_id, self.video_info)
+    
+    def _get_video_id(self, url):
+        """Extract the video ID from a YouTube URL"""
+        match = _YT_URL_RE.match(url.strip())
+        return match.group(1) or match.group(2)
+    
+    def _load_cached_info(self, video_id):
+        """Load cached video info if it is still fresh, else None"""
+        cache_path = _INFO_CACHE_DIR / f'{video_id}.json'
+        try:
+            if time.time() - cache_path.stat().st_mtime > _INFO_CACHE_TTL:
+                return None
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_cached_info(self, video_id, info):
+        """Save video info to the on-disk cache, ignoring failures"""
+        try:
+            _INFO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Keep the full info minus the requested_* selection keys: the
+            # download reprocesses its formats
+            with open(_INFO_CACHE_DIR / f'{video_id}.json', 'w', encoding='utf-8') as f:
+                json.dump(self._ydl.sanitize_info(info, remove_private_keys=True), f)
+        except (OSError, TypeError, ValueError):
+            pass
+    
+    def _drop_cached_info(self, video_id):
+        """Remove a video's entry from the on-disk cache"""
+        try:
+            (_INFO_CACHE_DIR / f'{video_id}.json').unlink(missing_ok=True)
+        except OSError:
+            pass
+    
     def get_subtitle_languages(self):
         """Get available subtitle languages"""
-        if not self.available_subtitles:
+        if not self._has_subs:
             return []
         
         # Prefer manual subtitles over auto-generated
@@ -129,21 +235,7 @@ class YouTubeProcessor:
     
     def _get_language_name(self, lang_code):
         """Get language name from code"""
-        lang_names = {
-            'en': 'English',
-            'es': 'Spanish', 
-            'fr': 'French',
-            'de': 'German',
-            'it': 'Italian',
-            'pt': 'Portuguese',
-            'ru': 'Russian',
-            'ja': 'Japanese',
-            'ko': 'Korean',
-            'zh': 'Chinese',
-            'ar': 'Arabic',
-            'hi': 'Hindi'
-        }
-        return lang_names.get(lang_code, lang_code.upper())
+        return _LANG_NAMES.get(lang_code, lang_code.upper())
     
     def select_subtitle_language(self):
         """Let user select subtitle language"""
@@ -152,10 +244,10 @@ class YouTubeProcessor:
         if not languages:
             return None
         
-        print(f"\nAvailable subtitles:")
-        for i, (code, name, type_) in enumerate(languages, 1):
-            marker = "[M]" if type_ == 'manual' else "[A]"
-            print(f"  {i}. {marker} {name}")
+        # Render the whole menu with a single write
+        menu = [f"  {i}. {'[M]' if type_ == 'manual' else '[A]'} {name}" for i, (code, name, type_) in enumerate(languages, 1)]
+        sys.stdout.write("\nAvailable subtitles:\n" + '\n'.join(menu) + '\n')
+        sys.stdout.flush()
         
         while True:
             try:
@@ -163,15 +255,14 @@ class YouTubeProcessor:
                 if not choice:
                     return None
                 
-                idx = int(choice) - 1
-                if 0 <= idx < len(languages):
-                    selected = languages[idx]
+                if not choice.isdecimal():
+                    print("Please enter a number.")
+                elif 1 <= (idx := int(choice)) <= len(languages):
+                    selected = languages[idx - 1]
                     print(f"Selected: {selected[1]}")
                     return selected[0]  # Return language code
                 else:
                     print("Invalid choice. Try again.")
-            except ValueError:
-                print("Please enter a number.")
             except KeyboardInterrupt:
                 return None
     
@@ -194,14 +285,10 @@ class YouTubeProcessor:
         return f"{num:,}"
     
     def _format_date(self, date_str):
-        """Format upload date"""
-        if not date_str:
-            return "N/A"
-        try:
-            date_obj = datetime.strptime(date_str, '%Y%m%d')
-            return date_obj.strftime('%Y-%m-%d')
-        except:
-            return date_str
+        """Format upload date (YYYYMMDD -> YYYY-MM-DD)"""
+        if date_str and len(date_str) == 8 and date_str.isdigit():
+            return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+        return date_str or "N/A"
     
     def parse_timestamp(self, timestamp):
         """Parse timestamp in format HH:MM:SS or MM:SS to seconds"""
@@ -264,158 +351,312 @@ class YouTubeProcessor:
         
         # Generate output filename if not provided
         if not output_path:
-            safe_title = "".join(c for c in self.video_info['title'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            safe_title = safe_title[:50]  # Limit filename length
+            safe_title = _SAFE_TITLE_RE.sub('', self.video_info['title'])[:50].rstrip()  # Limit filename length
             output_path = f"{safe_title}_{start_time.replace(':', '-')}_to_{end_time.replace(':', '-')}.mp4"
         
-        # Download video
-        temp_video = "temp_video.%(ext)s"
-        
         ydl_opts = {
             'format': quality_format,
-            'outtmpl': temp_video,
-            'quiet': True,
+            'no_warnings': False,
+            'concurrent_fragment_downloads': 8,  # Parallel DASH fragment fetches
+            'http_chunk_size': 10485760,  # 10 MiB chunks for progressive streams
         }
         
-        # Add subtitle options if requested
-        if subtitle_lang:
+        # Use aria2c for multi-connection downloads when it is installed
+        if shutil.which('aria2c'):
+            ydl_opts.update({
+                'external_downloader': {'default': 'aria2c'},
+                'external_downloader_args': {'aria2c': ['-x', '8', '-s', '8', '-k', '1M', '--console-log-level=warn']},
+            })
+        
+        # Without burned-in subtitles, let yt-dlp fetch only the requested
+        # time window straight into the output file - no separate trim pass
+        if not subtitle_lang:
             ydl_opts.update({
-                'writesubtitles': True,
-                'writeautomaticsub': True,
-                'subtitleslangs': [subtitle_lang],
-                'subtitlesformat': 'srt',  # Changed to SRT format for better compatibility
+                'outtmpl': output_path,
+                'download_ranges': yt_dlp.utils.download_range_func(None, [(start_seconds, end_seconds)]),
+                'force_keyframes_at_cuts': True,
             })
+            
+            print(f"Downloading video from {start_time} to {end_time}...")
+            try:
+                self._update_ydl_params(ydl_opts)
+                info = self._download_video_info()
+                
+                actual_output = self._get_downloaded_path(info)
+                if not os.path.exists(actual_output):
+                    raise Exception("Downloaded video file not found")
+            except Exception as e:
+                self._cleanup_temp_files(os.path.splitext(output_path)[0])
+                raise Exception(f"Failed to download/trim video: {str(e)}")
+            
+            return actual_output
+        
+        # Download video
+        temp_video = "temp_video.%(ext)s"
+        ydl_opts['outtmpl'] = temp_video
+        
+        # Subtitles need the full download so the SRT can be trimmed alongside
+        subtitle_url = self._get_srt_url(subtitle_lang)
+        subtitle_path = f"temp_video.{subtitle_lang}.srt"
+        self._temp_paths.append(Path(subtitle_path))
         
         print("Downloading video...")
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([self.video_url])
+            # Reuse the info dict from fetch_stats instead of extracting again,
+            # and fetch the SRT over a second connection while the video downloads
+            self._update_ydl_params(ydl_opts)
+            info_from_cache = self._info_from_cache
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                video_future = executor.submit(self._download_video_info)
+                subtitle_future = executor.submit(self._download_srt, subtitle_url, subtitle_path) if subtitle_url else None
+                
+                info = video_future.result()
+                subtitle_error = subtitle_future.exception() if subtitle_future else None
             
-            # Find the actual downloaded files
-            video_files = [f for f in os.listdir('.') if f.startswith('temp_video') and not f.endswith(('.srt', '.vtt'))]
-            if not video_files:
-                raise Exception("Downloaded video file not found")
+            # A refetch during the video download replaces the cached SRT URL too
+            if info_from_cache and not self._info_from_cache:
+                subtitle_url = self._get_srt_url(subtitle_lang)
+                subtitle_error = None
+                if subtitle_url:
+                    try:
+                        self._download_srt(subtitle_url, subtitle_path)
+                    except _SRT_DOWNLOAD_ERRORS as e:
+                        subtitle_error = e
             
-            actual_video_file = video_files[0]
+            if subtitle_error and not isinstance(subtitle_error, _SRT_DOWNLOAD_ERRORS):
+                raise subtitle_error
             
-            # Check for subtitle file
-            subtitle_files = [f for f in os.listdir('.') if f.startswith('temp_video') and f.endswith('.srt')]
-            actual_subtitle_file = subtitle_files[0] if subtitle_files else None
+            actual_subtitle_file = None
+            if not subtitle_url:
+                print("No SRT subtitles available for this language, saving video without subtitles...")
+            elif subtitle_error:
+                print(f"Subtitle download failed ({subtitle_error}), saving video without subtitles...")
+            else:
+                actual_subtitle_file = subtitle_path
+            
+            actual_video_file = self._get_downloaded_path(info)
+            self._temp_paths.append(Path(actual_video_file))
+            
+            if not os.path.exists(actual_video_file):
+                raise Exception("Downloaded video file not found")
             
             # Trim video using ffmpeg
             print(f"Trimming video from {start_time} to {end_time}...")
             duration = end_seconds - start_seconds
             
-            # Build ffmpeg command
-            input_video = ffmpeg.input(actual_video_file, ss=start_seconds, t=duration)
+            # Build ffmpeg command - input-side seek jumps straight to the nearest keyframe
+            input_video = ffmpeg.input(actual_video_file, ss=start_seconds)
             
             if actual_subtitle_file and subtitle_lang:
                 print("Adding subtitles...")
                 # Create a temporary trimmed subtitle file
                 temp_trimmed_subs = "temp_trimmed_subs.srt"
+                self._temp_paths.append(Path(temp_trimmed_subs))
                 self._trim_subtitle_file(actual_subtitle_file, temp_trimmed_subs, start_seconds, end_seconds)
                 
-                # Burn subtitles into video
-                output = ffmpeg.output(
-                    input_video,
-                    output_path,
-                    vf=f"subtitles={temp_trimmed_subs}:force_style='FontSize=20,PrimaryColour=&Hffffff,OutlineColour=&H000000,Outline=2,Shadow=1'"
-                )
+                # Burn subtitles into video, retrying with libx264 if the
+                # hardware encoder is listed but not usable on this machine
+                encoder = self._get_video_encoder()
+                output = self._burn_output(input_video, output_path, duration, temp_trimmed_subs, encoder)
+                fallback = None
+                if encoder is not _SOFTWARE_ENCODER:
+                    fallback = self._burn_output(input_video, output_path, duration, temp_trimmed_subs, _SOFTWARE_ENCODER)
             else:
-                output = ffmpeg.output(input_video, output_path, c='copy')
+                output = self._copy_output(input_video, output_path, duration)
             
             # Run ffmpeg with error handling
             try:
                 output.overwrite_output().run(capture_stdout=True, capture_stderr=True)
             except ffmpeg.Error as e:
-                # If subtitle burning fails, try without subtitles
-                if actual_subtitle_file:
+                if not actual_subtitle_file:
+                    raise e
+                try:
+                    if not fallback:
+                        raise e
+                    print("Hardware encoding failed, retrying with libx264...")
+                    fallback.overwrite_output().run(capture_stdout=True, capture_stderr=True)
+                except ffmpeg.Error:
+                    # If subtitle burning fails, try without subtitles
                     print("Subtitle processing failed, saving video without subtitles...")
-                    output = ffmpeg.output(input_video, output_path, c='copy')
+                    output = self._copy_output(input_video, output_path, duration)
                     output.overwrite_output().run(capture_stdout=True, capture_stderr=True)
-                else:
-                    raise e
             
             # Clean up temp files
-            temp_files = [f for f in os.listdir('.') if f.startswith('temp_video') or f.startswith('temp_trimmed_subs')]
-            for temp_file in temp_files:
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
+            self._cleanup_temp_files()
             
             return output_path
             
         except Exception as e:
             # Clean up temp files if they exist
-            temp_files = [f for f in os.listdir('.') if f.startswith('temp_video') or f.startswith('temp_trimmed_subs')]
-            for temp_file in temp_files:
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
+            self._cleanup_temp_files()
             raise Exception(f"Failed to download/trim video: {str(e)}")
     
+    def _cleanup_temp_files(self, prefix='temp_video'):
+        """Remove the temp files recorded during download"""
+        for temp_path in self._temp_paths:
+            try:
+                temp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+        self._temp_paths = []
+        
+        # An interrupted download leaves yt-dlp partial files that were never recorded
+        directory, name = os.path.split(prefix)
+        name += '.'
+        with os.scandir(directory or '.') as entries:
+            for entry in entries:
+                if entry.name.startswith(name) and _LEFTOVER_RE.fullmatch(entry.name[len(name):]):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+    
+    def _get_srt_url(self, subtitle_lang):
+        """Get the SRT download URL for a language, preferring manual subtitles"""
+        for source in ('subtitles', 'automatic_captions'):
+            for sub_format in self.video_info.get(source, {}).get(subtitle_lang, []):
+                if sub_format.get('ext') == 'srt' and sub_format.get('url'):
+                    return sub_format['url']
+        return None
+    
+    def _download_srt(self, srt_url, dest):
+        """Download an SRT file, raising one of _SRT_DOWNLOAD_ERRORS on failure"""
+        # The shared session applies socket_timeout, cookies, proxy and headers
+        with self._ydl.urlopen(srt_url) as response, open(dest, 'wb') as f:
+            shutil.copyfileobj(response, f)
+    
+    def _download_video_info(self):
+        """Download the video from the fetched info using the current params"""
+        # Drop the requested_* keys left by the default format selection in
+        # fetch_stats, as yt-dlp's --load-info-json does, so the chosen
+        # quality is actually selected on this pass
+        info = self._ydl.sanitize_info(self.video_info, remove_private_keys=True)
+        try:
+            return self._ydl.process_ie_result(info, download=True)
+        except yt_dlp.utils.DownloadError as e:
+            if not self._info_from_cache or not self._is_expired_url_error(e):
+                raise
+        
+        # Signed format URLs in cached info can expire or be bound to another IP
+        print("Cached video info is stale, fetching it again...")
+        self._drop_cached_info(self._video_id)
+        self._extract_video_info()
+        info = self._ydl.sanitize_info(self.video_info, remove_private_keys=True)
+        return self._ydl.process_ie_result(info, download=True)
+    
+    def _is_expired_url_error(self, error):
+        """Check whether a DownloadError came from an HTTP 403/410 response"""
+        cause = error.exc_info[1] if error.exc_info else None
+        return isinstance(cause, yt_dlp.networking.exceptions.HTTPError) and cause.status in (403, 410)
+    
+    def _get_downloaded_path(self, info):
+        """Get the file yt-dlp actually wrote for a processed info dict"""
+        # yt-dlp may correct the extension (clip.mov -> clip.mov.mp4)
+        downloads = info.get('requested_downloads') or [{}]
+        return downloads[0].get('filepath') or self._ydl.prepare_filename(info)
+    
+    def _update_ydl_params(self, ydl_opts):
+        """Apply per-download options to the shared YoutubeDL instance"""
+        params = dict(ydl_opts)
+        # YoutubeDL normalises these in its constructor, so mirror that here
+        if 'outtmpl' in params:
+            params['outtmpl'] = {'default': params['outtmpl']}
+        if 'format' in params:
+            self._ydl.format_selector = self._ydl.build_format_selector(params['format'])
+        self._ydl.params.update(params)
+    
+    def _get_video_encoder(self):
+        """Pick the first available hardware H.264 encoder, or libx264"""
+        if self._video_encoder is None:
+            self._video_encoder = _SOFTWARE_ENCODER
+            try:
+                result = subprocess.run(
+                    ['ffmpeg', '-hide_banner', '-encoders'],
+                    capture_output=True, text=True, check=True
+                )
+                available = set(result.stdout.split())
+                for name, opts in _HW_ENCODERS:
+                    if name in available:
+                        self._video_encoder = (name, opts)
+                        break
+            except (OSError, subprocess.CalledProcessError):
+                pass
+        return self._video_encoder
+    
+    def _burn_output(self, input_video, output_path, duration, subtitle_file, encoder):
+        """Build an ffmpeg output that burns subtitles in with the given encoder"""
+        vcodec, opts = encoder
+        return ffmpeg.output(
+            input_video,
+            output_path,
+            t=duration,
+            vcodec=vcodec,
+            movflags='+faststart',
+            vf=f"subtitles={subtitle_file}:force_style='FontSize=20,PrimaryColour=&Hffffff,OutlineColour=&H000000,Outline=2,Shadow=1'",
+            **opts
+        )
+    
+    def _copy_output(self, input_video, output_path, duration):
+        """Build a stream-copy ffmpeg output for the trimmed segment"""
+        return ffmpeg.output(
+            input_video,
+            output_path,
+            t=duration,
+            c='copy',
+            avoid_negative_ts='make_zero',
+            movflags='+faststart'
+        )
+    
     def _trim_subtitle_file(self, input_srt, output_srt, start_seconds, end_seconds):
         """Trim subtitle file to match video segment"""
         try:
-            with open(input_srt, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Simple SRT parsing and trimming
-            blocks = content.strip().split('\n\n')
-            trimmed_blocks = []
+            # Parse every cue in one pass over the mapped file, working in
+            # integer milliseconds and copying cue text through as raw bytes
+            start_ms = int(start_seconds * 1000)
+            end_ms = int(end_seconds * 1000)
             counter = 1
             
-            for block in blocks:
-                lines = block.strip().split('\n')
-                if len(lines) >= 3:
-                    try:
-                        time_line = lines[1]
-                        start_time_str, end_time_str = time_line.split(' --> ')
-                        
-                        sub_start = self._srt_time_to_seconds(start_time_str)
-                        sub_end = self._srt_time_to_seconds(end_time_str)
-                        
-                        # Check if subtitle overlaps with our trim range
-                        if sub_end > start_seconds and sub_start < end_seconds:
-                            # Adjust subtitle timing relative to new start
-                            new_start = max(0, sub_start - start_seconds)
-                            new_end = min(end_seconds - start_seconds, sub_end - start_seconds)
-                            
-                            if new_end > new_start:
-                                new_start_str = self._seconds_to_srt_time(new_start)
-                                new_end_str = self._seconds_to_srt_time(new_end)
-                                
-                                new_block = f"{counter}\n{new_start_str} --> {new_end_str}\n" + '\n'.join(lines[2:])
-                                trimmed_blocks.append(new_block)
-                                counter += 1
-                    except:
+            with open(input_srt, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content, \
+                    open(output_srt, 'wb') as out:
+                for match in _SRT_RE.finditer(content):
+                    text = match.group(10).rstrip(b'\r\n')
+                    if not text:
                         continue
-            
-            with open(output_srt, 'w', encoding='utf-8') as f:
-                f.write('\n\n'.join(trimmed_blocks))
+                    
+                    h1, m1, s1, ms1, h2, m2, s2, ms2 = map(int, match.group(2, 3, 4, 5, 6, 7, 8, 9))
+                    sub_start_ms = ((h1 * 60 + m1) * 60 + s1) * 1000 + ms1
+                    sub_end_ms = ((h2 * 60 + m2) * 60 + s2) * 1000 + ms2
+                    
+                    # Check if subtitle overlaps with our trim range
+                    if sub_end_ms <= start_ms or sub_start_ms >= end_ms:
+                        continue
+                    
+                    # Adjust subtitle timing relative to new start
+                    new_start = max(0, sub_start_ms - start_ms)
+                    new_end = min(end_ms, sub_end_ms) - start_ms
+                    
+                    if new_end > new_start:
+                        header = (
+                            f"{counter}\n{self._ms_to_srt_time(new_start)} --> "
+                            f"{self._ms_to_srt_time(new_end)}\n"
+                        )
+                        out.write(header.encode('ascii'))
+                        out.write(text.replace(b'\r\n', b'\n'))
+                        out.write(b'\n\n')
+                        counter += 1
                 
         except Exception as e:
             # If subtitle trimming fails, create empty file
             with open(output_srt, 'w', encoding='utf-8') as f:
                 f.write("")
     
-    def _srt_time_to_seconds(self, time_str):
-        """Convert SRT time format to seconds"""
-        time_str = time_str.replace(',', '.')
-        parts = time_str.split(':')
-        hours = int(parts[0])
-        minutes = int(parts[1])
-        seconds = float(parts[2])
-        return hours * 3600 + minutes * 60 + seconds
-    
-    def _seconds_to_srt_time(self, seconds):
-        """Convert seconds to SRT time format"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:06.3f}".replace('.', ',')
+    def _ms_to_srt_time(self, ms):
+        """Convert integer milliseconds to SRT time format"""
+        secs, ms = divmod(ms, 1000)
+        minutes, secs = divmod(secs, 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
 
 
 def get_user_input(prompt, validator=None):
@@ -442,22 +683,32 @@ def get_user_input(prompt, validator=None):
 
 def print_banner():
     """Print application banner"""
-    print(f"\n{'='*50}")
-    print(f"YOUTUBE VIDEO PROCESSOR")
-    print(f"Stats • Trim • Subtitles • Download")
-    print(f"{'='*50}")
+    sys.stdout.write(''.join([
+        f"\n{'='*50}\n",
+        "YOUTUBE VIDEO PROCESSOR\n",
+        "Stats • Trim • Subtitles • Download\n",
+        f"{'='*50}\n",
+    ]))
+    sys.stdout.flush()
 
 
 def print_stats(stats):
     """Print video statistics in a formatted way"""
-    print(f"\nVideo Information:")
-    print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-    print(f"Title: {stats['title']}")
-    print(f"Duration: {stats['duration']} | Views: {stats['view_count']} | Likes: {stats['like_count']}")
-    print(f"Channel: {stats['uploader']} | Upload Date: {stats['upload_date']}")
+    separator = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    lines = [
+        "\nVideo Information:\n",
+        separator,
+        f"Title: {stats['title']}\n",
+        f"Duration: {stats['duration']} | Views: {stats['view_count']} | Likes: {stats['like_count']}\n",
+        f"Channel: {stats['uploader']} | Upload Date: {stats['upload_date']}\n",
+    ]
     if stats['has_subtitles']:
-        print(f"Subtitles: Available")
-    print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        lines.append("Subtitles: Available\n")
+    lines.append(separator)
+    
+    # Render the whole block with a single write
+    sys.stdout.write(''.join(lines))
+    sys.stdout.flush()
 
 
 def ask_yes_no(question):
@@ -473,9 +724,18 @@ def ask_yes_no(question):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Fetch stats, trim and download YouTube videos with subtitles")
+    parser.add_argument(
+        '--cookies-from-browser',
+        metavar='BROWSER',
+        choices=sorted(yt_dlp.cookies.SUPPORTED_BROWSERS),
+        help="Load YouTube cookies from a browser (e.g. chrome, firefox)"
+    )
+    args = parser.parse_args()
+    
     print_banner()
     
-    processor = YouTubeProcessor()
+    processor = YouTubeProcessor(cookies_from_browser=args.cookies_from_browser)
     
     try:
         # Get YouTube URL
@@ -557,6 +817,8 @@ def main():
     except Exception as e:
         print(f"\nError: {str(e)}")
         sys.exit(1)
+    finally:
+        processor.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,347 @@
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('yt_dlp')
+pytest.importorskip('ffmpeg')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+def _format(format_id, height, vcodec, acodec, ext='mp4'):
+    return {
+        'format_id': format_id,
+        'url': f'https://example.com/{format_id}',
+        'ext': ext,
+        'height': height,
+        'vcodec': vcodec,
+        'acodec': acodec,
+        'protocol': 'https',
+    }
+
+
+def _video_info():
+    return {
+        'id': 'abc123',
+        'title': 'Test video',
+        'extractor': 'youtube',
+        'extractor_key': 'Youtube',
+        'webpage_url': 'https://www.youtube.com/watch?v=abc123',
+        'formats': [
+            _format('18', 360, 'avc1', 'mp4a'),
+            _format('137', 1080, 'avc1', 'none'),
+            _format('140', None, 'none', 'mp4a', 'm4a'),
+        ],
+    }
+
+
+def _download_error(cause):
+    try:
+        raise cause
+    except Exception:
+        return main.yt_dlp.utils.DownloadError(str(cause), sys.exc_info())
+
+
+def _http_download_error(status):
+    response = main.yt_dlp.networking.Response(io.BytesIO(), 'https://example.com/18', {}, status=status)
+    return _download_error(main.yt_dlp.networking.exceptions.HTTPError(response))
+
+
+class FakeOutput:
+    """Stands in for an ffmpeg output node, writing the output file on run()"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def overwrite_output(self):
+        return self
+
+    def run(self, **kwargs):
+        Path(self.path).write_text('')
+
+
+@pytest.fixture
+def processor():
+    processor = main.YouTubeProcessor()
+    yield processor
+    processor.close()
+
+
+def test_download_uses_selected_quality_on_processed_info(processor):
+    # fetch_stats leaves the default best video+audio selection in video_info
+    processor._update_ydl_params({'format': 'bv*+ba/b'})
+    processor.video_info = processor._ydl.process_ie_result(_video_info(), download=False)
+    assert [f['format_id'] for f in processor.video_info['requested_formats']] == ['137', '140']
+
+    downloaded = []
+    processor._ydl.process_info = lambda info: downloaded.append(dict(info))
+    processor._update_ydl_params({'format': 'best[height<=360]/best'})
+    processor._download_video_info()
+
+    assert len(downloaded) == 1
+    assert downloaded[0]['format_id'] == '18'
+    assert 'requested_formats' not in downloaded[0]
+
+
+def test_cached_info_is_saved_without_requested_formats(processor, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, '_INFO_CACHE_DIR', tmp_path)
+    processor._update_ydl_params({'format': 'bv*+ba/b'})
+    info = processor._ydl.process_ie_result(_video_info(), download=False)
+
+    processor._save_cached_info('abc123', info)
+    cached = processor._load_cached_info('abc123')
+
+    assert cached['formats']
+    assert 'requested_formats' not in cached
+
+
+def test_download_from_stale_cache_refetches_info(processor, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, '_INFO_CACHE_DIR', tmp_path)
+    processor._save_cached_info('abc123', _video_info())
+    processor.fetch_stats('https://www.youtube.com/watch?v=abc123')
+    assert processor._info_from_cache
+
+    fresh_info = _video_info()
+    fresh_info['title'] = 'Fresh info'
+    processor._ydl.extract_info = lambda url, download: fresh_info
+
+    processed = []
+
+    def process_ie_result(info, download):
+        if not processed:
+            processed.append(None)
+            raise _http_download_error(403)
+        processed.append(info)
+        return info
+
+    processor._ydl.process_ie_result = process_ie_result
+    processor._download_video_info()
+
+    assert processed[-1]['title'] == 'Fresh info'
+    assert not processor._info_from_cache
+    assert processor._load_cached_info('abc123')['title'] == 'Fresh info'
+
+
+@pytest.mark.parametrize('error', [
+    lambda: _http_download_error(404),
+    lambda: _download_error(OSError('No space left on device')),
+    lambda: main.yt_dlp.utils.DownloadError('ffmpeg is not installed'),
+])
+def test_download_from_cache_does_not_retry_other_errors(processor, tmp_path, monkeypatch, error):
+    monkeypatch.setattr(main, '_INFO_CACHE_DIR', tmp_path)
+    processor._save_cached_info('abc123', _video_info())
+    processor.fetch_stats('https://www.youtube.com/watch?v=abc123')
+
+    def extract_info(url, download):
+        raise AssertionError('cached info should not be refetched')
+
+    def process_ie_result(info, download):
+        raise error()
+
+    processor._ydl.extract_info = extract_info
+    processor._ydl.process_ie_result = process_ie_result
+
+    with pytest.raises(main.yt_dlp.utils.DownloadError):
+        processor._download_video_info()
+    assert processor._info_from_cache
+
+
+SRT = (
+    "1\n00:00:01,000 --> 00:00:04,500\nHello\nworld\n\n"
+    "2\n00:00:05,000 --> 00:00:12,250\nSecond\n\n"
+    "3\n00:01:00,000 --> 00:01:02,000\nLate\n"
+)
+TRIMMED_SRT = (
+    "1\n00:00:00,000 --> 00:00:01,500\nHello\nworld\n\n"
+    "2\n00:00:02,000 --> 00:00:07,000\nSecond\n\n"
+)
+EMPTY_CUE_SRT = (
+    "1\n00:00:11,000 --> 00:00:12,000\n\n"
+    "2\n00:00:13,000 --> 00:00:14,000\nB\n"
+)
+TRAILING_TIMING_SRT = (
+    "1\n00:00:11,000 --> 00:00:12,000 \nA\n\n"
+    "2\n00:00:13,000 --> 00:00:14,000 X1:100 X2:200 Y1:10 Y2:20\nB\n"
+)
+
+
+@pytest.mark.parametrize('newline', ['\n', '\r\n'])
+@pytest.mark.parametrize('srt, start, end, expected', [
+    (SRT, 3, 10, TRIMMED_SRT),
+    (EMPTY_CUE_SRT, 10, 20, "1\n00:00:03,000 --> 00:00:04,000\nB\n\n"),
+    ('\ufeff' + SRT, 3, 10, TRIMMED_SRT),
+    (TRAILING_TIMING_SRT, 10, 20, "1\n00:00:01,000 --> 00:00:02,000\nA\n\n2\n00:00:03,000 --> 00:00:04,000\nB\n\n"),
+])
+def test_trim_subtitle_file(processor, tmp_path, newline, srt, start, end, expected):
+    input_srt = tmp_path / 'in.srt'
+    output_srt = tmp_path / 'out.srt'
+    input_srt.write_bytes(srt.replace('\n', newline).encode('utf-8'))
+
+    processor._trim_subtitle_file(str(input_srt), str(output_srt), start, end)
+
+    assert output_srt.read_text(encoding='utf-8') == expected
+
+
+def test_select_subtitle_language_rejects_non_decimal_digits(processor, monkeypatch):
+    processor._has_subs = True
+    processor.video_info = {'subtitles': {'en': []}, 'automatic_captions': {}}
+    answers = iter(['²', '1'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(answers))
+
+    assert processor.select_subtitle_language() == 'en'
+
+
+def test_cleanup_removes_download_leftovers_only(processor, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    leftovers = [
+        'temp_video.mp4', 'temp_video.mp4.part', 'temp_video.mp4.part-Frag3',
+        'temp_video.f137.mp4', 'temp_video.f140.m4a.part', 'temp_video.mp4.aria2',
+        'temp_video.temp.mp4', 'temp_video.mp4.ytdl',
+    ]
+    kept = ['temp_video_notes.txt', 'temp_videos.mp4', 'temp_video.backup.mp4']
+    for name in leftovers + kept:
+        (tmp_path / name).write_text('')
+    processor._temp_paths = [Path('temp_video.mp4')]
+
+    processor._cleanup_temp_files()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(kept)
+
+
+def test_ranged_download_returns_real_output_path(processor, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    processor.video_info = dict(_video_info(), duration=120)
+    (tmp_path / 'clip.mov.mp4').write_text('')
+    monkeypatch.setattr(
+        processor, '_download_video_info',
+        lambda: {'requested_downloads': [{'filepath': 'clip.mov.mp4'}]}
+    )
+
+    assert processor.download_and_trim('0:10', '0:20', 'best', output_path='clip.mov') == 'clip.mov.mp4'
+
+
+def test_failed_ranged_download_removes_partial_files(processor, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    processor.video_info = dict(_video_info(), duration=120)
+    (tmp_path / 'clip.mp4.part').write_text('')
+
+    def fail():
+        raise main.yt_dlp.utils.DownloadError('interrupted')
+
+    monkeypatch.setattr(processor, '_download_video_info', fail)
+
+    with pytest.raises(Exception, match='Failed to download/trim video'):
+        processor.download_and_trim('0:10', '0:20', 'best', output_path='clip.mp4')
+    assert not (tmp_path / 'clip.mp4.part').exists()
+
+
+def test_close_closes_shared_youtubedl(processor, monkeypatch):
+    closed = []
+    monkeypatch.setattr(processor._ydl, 'close', lambda: closed.append(True))
+
+    processor.close()
+
+    assert closed
+
+
+def test_download_srt_uses_shared_session(processor, tmp_path, monkeypatch):
+    requested = []
+
+    def urlopen(url):
+        requested.append(url)
+        return io.BytesIO(SRT.encode('utf-8'))
+
+    monkeypatch.setattr(processor._ydl, 'urlopen', urlopen)
+    dest = tmp_path / 'subs.srt'
+
+    processor._download_srt('https://example.com/subs.srt', str(dest))
+    assert requested == ['https://example.com/subs.srt']
+    assert dest.read_text(encoding='utf-8') == SRT
+
+
+def test_subtitle_download_tracks_real_video_path(processor, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    processor.video_info = dict(_video_info(), duration=120)
+    (tmp_path / 'temp_video.webm').write_text('')
+    monkeypatch.setattr(
+        processor, '_download_video_info',
+        lambda: {'requested_downloads': [{'filepath': 'temp_video.webm'}]}
+    )
+    trimmed = []
+
+    def copy_output(input_video, output_path, duration):
+        trimmed.append(input_video)
+        return FakeOutput(output_path)
+
+    monkeypatch.setattr(processor, '_copy_output', copy_output)
+
+    assert processor.download_and_trim('0:10', '0:20', 'best', 'en', output_path='clip.mp4') == 'clip.mp4'
+    assert trimmed
+    assert not (tmp_path / 'temp_video.webm').exists()
+
+
+def _subtitle_info(srt_url):
+    info = dict(_video_info(), duration=120)
+    info['subtitles'] = {'en': [{'ext': 'srt', 'url': srt_url}]}
+    return info
+
+
+def _fake_subtitle_run(processor, tmp_path, monkeypatch, urlopen):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'temp_video.mp4').write_text('')
+    monkeypatch.setattr(processor._ydl, 'urlopen', urlopen)
+    monkeypatch.setattr(processor, '_copy_output', lambda input_video, output_path, duration: FakeOutput(output_path))
+    monkeypatch.setattr(processor, '_get_video_encoder', lambda: main._SOFTWARE_ENCODER)
+    burned = []
+
+    def burn_output(input_video, output_path, duration, subtitle_file, encoder):
+        burned.append(Path(subtitle_file).read_text(encoding='utf-8'))
+        return FakeOutput(output_path)
+
+    monkeypatch.setattr(processor, '_burn_output', burn_output)
+    return burned
+
+
+def test_subtitle_download_failure_warns(processor, tmp_path, monkeypatch, capsys):
+    processor.video_info = _subtitle_info('https://example.com/subs.srt')
+    monkeypatch.setattr(
+        processor, '_download_video_info',
+        lambda: {'requested_downloads': [{'filepath': 'temp_video.mp4'}]}
+    )
+
+    def urlopen(url):
+        raise main.yt_dlp.networking.exceptions.TransportError('timed out')
+
+    burned = _fake_subtitle_run(processor, tmp_path, monkeypatch, urlopen)
+
+    assert processor.download_and_trim('0:10', '0:20', 'best', 'en', output_path='clip.mp4') == 'clip.mp4'
+    assert not burned
+    assert 'Subtitle download failed' in capsys.readouterr().out
+
+
+def test_subtitle_url_is_taken_from_refetched_info(processor, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, '_INFO_CACHE_DIR', tmp_path / 'cache')
+    processor._save_cached_info('abc123', _subtitle_info('https://example.com/old.srt'))
+    processor.fetch_stats('https://www.youtube.com/watch?v=abc123')
+    processor._ydl.extract_info = lambda url, download: _subtitle_info('https://example.com/new.srt')
+
+    def process_ie_result(info, download):
+        if info['subtitles']['en'][0]['url'].endswith('old.srt'):
+            raise _http_download_error(403)
+        return {'requested_downloads': [{'filepath': 'temp_video.mp4'}]}
+
+    processor._ydl.process_ie_result = process_ie_result
+
+    def urlopen(url):
+        if url.endswith('old.srt'):
+            raise main.yt_dlp.networking.exceptions.TransportError('HTTP Error 403')
+        return io.BytesIO(SRT.encode('utf-8'))
+
+    burned = _fake_subtitle_run(processor, tmp_path, monkeypatch, urlopen)
+
+    processor.download_and_trim('0:03', '0:10', 'best', 'en', output_path='clip.mp4')
+    assert burned == [TRIMMED_SRT]